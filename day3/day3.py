@@ -1,4 +1,6 @@
-from typing import List
+import hashlib
+from collections import OrderedDict
+from typing import List, Tuple
 
 
 def read_lines(path: str) -> List[str]:
@@ -6,20 +8,16 @@ def read_lines(path: str) -> List[str]:
         return [line.rstrip("\n") for line in f]
 
 
-def best_k_digits(line: str, k: int) -> int:
-    """Return the maximum integer obtainable by selecting exactly `k`
-    digits from `line` while preserving their order.
+CACHE_SIZE = 4096
+# Past this many picks the per-digit `find` scans cost more than one stack
+# pass over the line, even though each scan runs in C.
+FIND_MAX_K = 256
+
+_memo: "OrderedDict[Tuple[bytes, int], int]" = OrderedDict()
 
-    Uses a greedy monotonic-stack approach: keep the largest possible
-    digits while ensuring enough remaining digits to fill `k` slots.
-    """
-    s = line.strip()
-    n = len(s)
-    if k <= 0:
-        return 0
-    if n < k:
-        return 0
 
+def _stack_best_k_digits(s: str, k: int) -> int:
+    n = len(s)
     stack: List[str] = []
     for i, ch in enumerate(s):
         # number of characters remaining after this one
@@ -35,6 +33,61 @@ def best_k_digits(line: str, k: int) -> int:
     return int(''.join(stack))
 
 
+def _find_best_k_digits(s: str, k: int) -> int:
+    n = len(s)
+    pos = 0
+    value = 0
+    for j in range(k):
+        # the j-th pick must leave at least k - j - 1 digits after it
+        last = n - (k - j)
+        for d in "9876543210":
+            p = s.find(d, pos, last + 1)
+            if p != -1:
+                value = value * 10 + int(d)
+                pos = p + 1
+                break
+        else:
+            raise ValueError(f"no digit in {s[pos:last + 1]!r}")
+    return value
+
+
+def best_k_digits(line: str, k: int) -> int:
+    """Return the maximum integer obtainable by selecting exactly `k`
+    digits from `line` while preserving their order.
+
+    For small `k`, greedily picks each slot's largest digit whose next
+    occurrence still leaves enough digits for the remaining slots: at most
+    10 `str.find` calls per pick, each scanning up to n - k characters in
+    C. Otherwise falls back to a single greedy monotonic-stack pass.
+    Results are memoized in a bounded LRU keyed by a digest of the line
+    and `k`, so repeated banks are not recomputed and long lines are not
+    kept alive by the cache.
+    """
+    s = line.strip()
+    n = len(s)
+    if k <= 0:
+        return 0
+    if n < k:
+        return 0
+    if not (s.isascii() and s.isdigit()):
+        raise ValueError(f"bank contains non-digit characters: {s!r}")
+
+    key = (hashlib.blake2b(s.encode(), digest_size=16).digest(), k)
+    value = _memo.get(key)
+    if value is not None:
+        _memo.move_to_end(key)
+        return value
+
+    if k <= FIND_MAX_K and k * 10 <= n:
+        value = _find_best_k_digits(s, k)
+    else:
+        value = _stack_best_k_digits(s, k)
+    _memo[key] = value
+    if len(_memo) > CACHE_SIZE:
+        _memo.popitem(last=False)
+    return value
+
+
 def day3(path: str, k: int = 2) -> int:
     lines = read_lines(path)
     total = 0
@@ -59,6 +112,21 @@ if __name__ == "__main__":
     # expected value provided in the problem statement
     assert t1_k12 == 3121910778619, f"test1 (k=12) failed: {t1_k12} != 3121910778619"
 
+    # Edge cases for best_k_digits, including memoized repeats
+    assert best_k_digits("987654321111111", 2) == 98
+    assert best_k_digits("987654321111111", 2) == 98
+    assert best_k_digits("234234234234278", 2) == 78
+    assert best_k_digits("234234234234278", 12) == 434234234278
+    assert best_k_digits("12345", 5) == 12345
+    assert best_k_digits("7777777", 3) == 777
+    assert best_k_digits("9" + "1" * 40, 2) == 91
+    try:
+        best_k_digits("12a45", 2)
+    except ValueError:
+        pass
+    else:
+        raise AssertionError("non-digit bank was not rejected")
+
     # If user supplied a path, print the part-2 (k=12) result for that path;
     # otherwise compute both parts for the real input file and assert
     # they match the provided expected answers.
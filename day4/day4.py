@@ -1,4 +1,11 @@
-from typing import List
+import os
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from multiprocessing import Array, Barrier, Process
+from multiprocessing import shared_memory
+from multiprocessing.connection import wait
+from multiprocessing.util import Finalize
+from typing import Iterator, List, Optional, Sequence, Tuple, Union
 
 
 def read_lines(path: str) -> List[str]:
@@ -81,6 +88,224 @@ def day4_remove_all(path: str) -> int:
     return total_removed
 
 
+ROLL = ord('@')
+EMPTY = ord('.')
+
+
+def _load_shared_grid(path: str) -> Tuple[shared_memory.SharedMemory, int, int]:
+    """Stream the grid into a shared memory block, one byte per cell.
+
+    Rows are read straight into the block, so the parent never holds a
+    second copy of the grid. Returns (shm, rows, cols); the caller owns
+    the block and must unlink it.
+    """
+    size = os.path.getsize(path)
+    with open(path, "rb") as f:
+        first = f.readline()
+        cols = len(first.rstrip(b"\r\n"))
+        if cols == 0:
+            return shared_memory.SharedMemory(create=True, size=1), 0, 0
+        terminator = first[cols:]
+        newline = len(terminator)
+        stride = cols + newline
+        rows = (size + newline) // stride
+        if size not in (rows * stride, rows * stride - newline):
+            raise ValueError(f"{path} is not a rectangular grid of {cols} columns")
+        shm = shared_memory.SharedMemory(create=True, size=rows * cols)
+        try:
+            f.seek(0)
+            for r in range(rows):
+                if f.readinto(shm.buf[r * cols:(r + 1) * cols]) != cols:
+                    raise ValueError(f"row {r} of {path} is shorter than {cols} cells")
+                end = f.read(newline)
+                if end != terminator and not (r == rows - 1 and end == b""):
+                    raise ValueError(f"row {r} of {path} is not {cols} cells wide")
+        except BaseException:
+            shm.close()
+            shm.unlink()
+            raise
+    return shm, rows, cols
+
+
+def _split_bands(rows: int, workers: Optional[int]) -> List[Tuple[int, int]]:
+    """Split `rows` into contiguous (start, stop) row bands, one per worker."""
+    n = max(1, min(workers or os.cpu_count() or 1, rows))
+    step, extra = divmod(rows, n)
+    bands = []
+    start = 0
+    for i in range(n):
+        stop = start + step + (1 if i < extra else 0)
+        bands.append((start, stop))
+        start = stop
+    return bands
+
+
+def _band_views(buf, rows: int, cols: int, start: int, stop: int) -> List[memoryview]:
+    """Return views of rows [start, stop) plus a one-row halo above and below.
+
+    Nothing is copied; halo rows outside the grid are all empty cells.
+    """
+    empty = memoryview(b'.' * cols)
+    return [buf[r * cols:(r + 1) * cols] if 0 <= r < rows else empty
+            for r in range(start - 1, stop + 1)]
+
+
+def _read_band(buf, rows: int, cols: int, start: int, stop: int) -> List[bytearray]:
+    """Copy rows [start, stop) plus halos into private, writable rows."""
+    return [bytearray(row) for row in _band_views(buf, rows, cols, start, stop)]
+
+
+def _accessible(band: Sequence[Union[bytearray, memoryview]],
+                cols: int) -> Iterator[Tuple[int, int]]:
+    """Yield (r, c) of rolls with fewer than four roll neighbors.
+
+    `band` carries a halo row at each end; only the inner rows are scanned
+    and returned row indices are relative to `band`.
+    """
+    offsets = [(-1, -1), (-1, 0), (-1, 1), (0, -1),
+               (0, 1), (1, -1), (1, 0), (1, 1)]
+    for r in range(1, len(band) - 1):
+        row = band[r]
+        for c in range(cols):
+            if row[c] != ROLL:
+                continue
+            adj = 0
+            for dr, dc in offsets:
+                cc = c + dc
+                if 0 <= cc < cols and band[r + dr][cc] == ROLL:
+                    adj += 1
+                    if adj >= 4:
+                        break
+            if adj < 4:
+                yield r, c
+
+
+_worker_shm: Optional[shared_memory.SharedMemory] = None
+
+
+def _attach_worker(name: str) -> None:
+    global _worker_shm
+    _worker_shm = shared_memory.SharedMemory(name=name)
+    # Pool workers leave through os._exit, which skips atexit handlers.
+    Finalize(None, _worker_shm.close, exitpriority=0)
+
+
+def _count_band(args: Tuple[int, int, int, int]) -> int:
+    rows, cols, start, stop = args
+    assert _worker_shm is not None, "pool worker was not attached to the grid"
+    band = _band_views(_worker_shm.buf, rows, cols, start, stop)
+    try:
+        return sum(1 for _ in _accessible(band, cols))
+    finally:
+        for row in band:
+            row.release()
+
+
+def day4_tiled(path: str, workers: Optional[int] = None) -> int:
+    """Parallel `day4`: count accessible rolls per row band in a process pool.
+
+    The grid lives in shared memory so it is never pickled; each worker
+    scans its band plus one halo row on either side in place.
+    """
+    shm, rows, cols = _load_shared_grid(path)
+    try:
+        if rows == 0:
+            return 0
+        bands = _split_bands(rows, workers)
+        # Unlike multiprocessing.Pool, the executor notices a worker that is
+        # killed outright and fails the pending tasks instead of hanging.
+        with ProcessPoolExecutor(len(bands), initializer=_attach_worker,
+                                 initargs=(shm.name,)) as pool:
+            try:
+                counts = list(pool.map(_count_band, [(rows, cols, a, b) for a, b in bands]))
+            except BrokenProcessPool as e:
+                raise RuntimeError("band worker exited unexpectedly") from e
+        return sum(counts)
+    finally:
+        shm.close()
+        shm.unlink()
+
+
+def _remove_band(name: str, rows: int, cols: int, start: int, stop: int,
+                 index: int, removed, totals, barrier) -> None:
+    """Run the wave loop for one band until no band removes anything.
+
+    Each wave removes accessible rolls from the private band copy, then
+    publishes only the first and last owned rows to shared memory and
+    pulls the neighbors' edge rows back in as halos.
+    """
+    shm = shared_memory.SharedMemory(name=name)
+    try:
+        buf = shm.buf
+        band = _read_band(buf, rows, cols, start, stop)
+        total = 0
+        while True:
+            to_remove = list(_accessible(band, cols))
+            for r, c in to_remove:
+                band[r][c] = EMPTY
+            total += len(to_remove)
+            removed[index] = len(to_remove)
+            buf[start * cols:(start + 1) * cols] = band[1]
+            buf[(stop - 1) * cols:stop * cols] = band[-2]
+            barrier.wait()
+            if start > 0:
+                band[0][:] = buf[(start - 1) * cols:start * cols]
+            if stop < rows:
+                band[-1][:] = buf[stop * cols:(stop + 1) * cols]
+            done = not any(removed[:])
+            # Everyone must finish reading halos and counts before the
+            # next wave starts overwriting them.
+            barrier.wait()
+            if done:
+                break
+        totals[index] = total
+    except BaseException:
+        # Release the other bands instead of leaving them at the barrier.
+        barrier.abort()
+        raise
+    finally:
+        shm.close()
+
+
+def day4_remove_all_tiled(path: str, workers: Optional[int] = None) -> int:
+    """Parallel `day4_remove_all` using bulk-synchronous waves over row bands.
+
+    One process per band keeps its rows privately; between waves only the
+    halo rows are exchanged through shared memory.
+    """
+    shm, rows, cols = _load_shared_grid(path)
+    try:
+        if rows == 0:
+            return 0
+        bands = _split_bands(rows, workers)
+        removed = Array('q', len(bands), lock=False)
+        totals = Array('q', len(bands), lock=False)
+        barrier = Barrier(len(bands))
+        procs = [Process(target=_remove_band,
+                         args=(shm.name, rows, cols, a, b, i, removed, totals, barrier))
+                 for i, (a, b) in enumerate(bands)]
+        for p in procs:
+            p.start()
+        # A worker that is killed outright cannot abort the barrier itself,
+        # so watch for the first failure and tear the rest down.
+        pending = {p.sentinel: p for p in procs}
+        while pending:
+            for sentinel in wait(list(pending)):
+                p = pending.pop(sentinel)
+                p.join()
+                if p.exitcode != 0:
+                    barrier.abort()
+                    for other in pending.values():
+                        other.terminate()
+                    for other in pending.values():
+                        other.join()
+                    raise RuntimeError(f"band worker exited with code {p.exitcode}")
+        return sum(totals)
+    finally:
+        shm.close()
+        shm.unlink()
+
+
 if __name__ == "__main__":
     import sys
 
@@ -95,6 +320,10 @@ if __name__ == "__main__":
     t1_removed = day4_remove_all(test1)
     assert t1_removed == 43, f"day4 part2 example failed: {t1_removed} != 43"
 
+    # Tiled variants must match the serial results, even with more bands than cores
+    assert day4_tiled(test1, workers=3) == t1
+    assert day4_remove_all_tiled(test1, workers=3) == t1_removed
+
     if len(sys.argv) > 1:
         print(day4(sys.argv[1]))
     else:
@@ -104,6 +333,8 @@ if __name__ == "__main__":
         # Assert known correct answers
         assert res1 == 1508, f"Day 4 part1 mismatch: {res1} != 1508"
         assert res2 == 8538, f"Day 4 part2 mismatch: {res2} != 8538"
+        assert day4_tiled(test2, workers=4) == res1
+        assert day4_remove_all_tiled(test2, workers=4) == res2
 
         print("Day 4 part1:", res1)
         print("Day 4 part2:", res2)